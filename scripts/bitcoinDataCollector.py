@@ -5,16 +5,63 @@ Fetches current and historical Bitcoin prices from CoinGecko API
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import numpy as np
 import json
 from pathlib import Path
 from datetime import datetime, timedelta
-import time
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import shutil
+import subprocess
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    pa = None
+
+# WriteOptions(quoting_header=...) needs pyarrow 22+; older installs use pandas' writer
+if pa is not None and int(pa.__version__.split('.')[0]) < 22:
+    pa = None
+
+FRICTIONLESS = shutil.which('frictionless')
+
+def write_json(path, obj):
+    """Write obj as indented JSON, using orjson when available"""
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=2)
+
+def write_json_gz(path, obj):
+    """Write obj as compact gzip-compressed JSON, using orjson when available"""
+    if orjson is not None:
+        payload = orjson.dumps(obj)
+    else:
+        payload = json.dumps(obj, separators=(',', ':')).encode()
+    with gzip.open(path, "wb", compresslevel=4) as f:
+        f.write(payload)
 
 class BitcoinDataCollector:
     def __init__(self):
         self.base_url = "https://api.coingecko.com/api/v3"
         self.coin_id = "bitcoin"
+        self.etag_file = Path("data/raw/.etag_historical")
+        self.historical_validators = {}
+
+        # Reuse one connection pool; retries back off on rate limits (429)
+        self.session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retries))
 
     def collect_current_price(self):
         """Fetch current Bitcoin price and market data"""
@@ -29,7 +76,7 @@ class BitcoinDataCollector:
         }
 
         print("🔍 Fetching current Bitcoin price...")
-        response = requests.get(url, params=params)
+        response = self.session.get(url, params=params, timeout=10)
 
         if response.status_code == 200:
             data = response.json()
@@ -46,14 +93,47 @@ class BitcoinDataCollector:
             'interval': 'daily'
         }
 
-        print(f"📈 Fetching {days} days of historical Bitcoin prices...")
-        response = requests.get(url, params=params)
+        # Replay validators from the previous run so an unchanged payload comes back as 304
+        cached = self.load_historical_validators()
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
 
-        if response.status_code == 200:
+        print(f"📈 Fetching {days} days of historical Bitcoin prices...")
+        response = self.session.get(url, params=params, headers=headers, timeout=10)
+
+        if response.status_code == 304 and cached:
+            payload_file = Path(cached['payload'])
+            print(f"♻️  Historical data unchanged, using cached {payload_file.name}")
+            self.historical_validators = cached
+            with gzip.open(payload_file, "rb") as f:
+                return json.loads(f.read())
+        elif response.status_code == 200:
+            # Only persisted by save_raw_data, once the payload itself is on disk
+            self.historical_validators = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }
             return response.json()
         else:
             raise Exception(f"Failed to fetch historical data: {response.status_code}")
 
+    def load_historical_validators(self):
+        """Load cached ETag/Last-Modified validators, or None if missing, corrupt or stale"""
+        try:
+            cached = json.loads(self.etag_file.read_text())
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(cached, dict) or not isinstance(cached.get('payload'), str):
+            return None
+        if not Path(cached['payload']).is_file():
+            return None
+        return cached
+
     def process_historical_data(self, raw_data):
         """Process historical market data into clean DataFrame"""
 
@@ -63,25 +143,34 @@ class BitcoinDataCollector:
         volumes = raw_data['total_volumes']
 
 
-        df_prices = pd.DataFrame(prices, columns=['timestamp', 'price'])
-        df_market_caps = pd.DataFrame(market_caps, columns=['timestamp', 'market_cap'])
-        df_volumes = pd.DataFrame(volumes, columns=['timestamp', 'volume'])
-
+        # CoinGecko returns the three series row-aligned on the same timestamps
+        timestamps = [row[0] for row in prices]
+        df = pd.DataFrame({
+            'timestamp': timestamps,
+            'price': [row[1] for row in prices],
+            'market_cap': [row[1] for row in market_caps],
+            'volume': [row[1] for row in volumes]
+        })
 
-        df = df_prices.merge(df_market_caps, on='timestamp')
-        df = df.merge(df_volumes, on='timestamp')
 
-
-        df['date'] = pd.to_datetime(df['timestamp'], unit='ms').dt.date
         df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df['date'] = df['datetime'].values.astype('datetime64[D]')
+        df = df.drop(columns='timestamp')
 
 
         df['price'] = df['price'].round(2)
-        df['market_cap'] = df['market_cap'].round(0).astype('int64')
-        df['volume'] = df['volume'].round(0).astype('int64')
+        for column in ('market_cap', 'volume'):
+            values = df[column].to_numpy()
+            if values.dtype.kind == 'i':
+                continue
+            if values.dtype.kind == 'f' and np.isfinite(values).all():
+                df[column] = np.rint(values).astype(np.int64, copy=False)
+            else:
+                # Missing/non-finite values must fail loudly rather than cast to INT64_MIN
+                df[column] = df[column].round(0).astype('int64')
 
 
-        df_final = df[['date', 'datetime', 'price', 'market_cap', 'volume']].copy()
+        df_final = df[['date', 'datetime', 'price', 'market_cap', 'volume']]
 
         return df_final
 
@@ -92,12 +181,20 @@ class BitcoinDataCollector:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
 
-        with open(f"data/raw/current_price_{timestamp}.json", "w") as f:
-            json.dump(current_data, f, indent=2)
+        write_json(f"data/raw/current_price_{timestamp}.json", current_data)
 
 
-        with open(f"data/raw/historical_data_{timestamp}.json", "w") as f:
-            json.dump(historical_data, f, indent=2)
+        historical_file = f"data/raw/historical_data_{timestamp}.json.gz"
+        write_json_gz(historical_file, historical_data)
+
+        # Tie the validators to the payload they describe so a later 304 can't resolve to another file
+        if self.historical_validators.get('etag') or self.historical_validators.get('last_modified'):
+            validators = {
+                'etag': self.historical_validators.get('etag'),
+                'last_modified': self.historical_validators.get('last_modified'),
+                'payload': historical_file
+            }
+            self.etag_file.write_text(json.dumps(validators))
 
         print(f"💾 Raw data saved with timestamp {timestamp}")
 
@@ -106,7 +203,18 @@ class BitcoinDataCollector:
         Path("data/processed").mkdir(parents=True, exist_ok=True)
 
         output_file = "data/processed/bitcoin_prices.csv"
-        df.to_csv(output_file, index=False)
+        if pa is not None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            # Match pandas' CSV output: "YYYY-MM-DD HH:MM:SS" datetimes and plain "YYYY-MM-DD" dates.
+            # The live "now" sample carries milliseconds, so truncate rather than safe-cast.
+            column = table.schema.get_field_index('datetime')
+            table = table.set_column(column, 'datetime', table['datetime'].cast(pa.timestamp('s'), safe=False))
+            column = table.schema.get_field_index('date')
+            table = table.set_column(column, 'date', table['date'].cast(pa.date32()))
+            # Unquoted header as pandas writes it; whole-number prices are written without ".0"
+            pacsv.write_csv(table, output_file, pacsv.WriteOptions(quoting_header="none"))
+        else:
+            df.to_csv(output_file, index=False)
 
         print(f"✅ Processed data saved to {output_file}")
         print(f"📊 Dataset contains {len(df)} daily records")
@@ -116,9 +224,6 @@ class BitcoinDataCollector:
     def create_datapackage(self, csv_file):
         """Create/update datapackage.json"""
 
-
-        df = pd.read_csv(csv_file)
-
         datapackage = {
             "name": "bitcoin-price-data",
             "title": "Bitcoin Price Data",
@@ -155,7 +260,7 @@ class BitcoinDataCollector:
                     "format": "csv",
                     "mediatype": "text/csv",
                     "encoding": "utf-8",
-                    "bytes": len(df) * 100,
+                    "bytes": Path(csv_file).stat().st_size,
                     "schema": {
                         "fields": [
                             {
@@ -209,14 +314,14 @@ def main():
 
     try:
 
-        current_data = collector.collect_current_price()
-        print(f"💰 Current Bitcoin Price: ${current_data['usd']:,.2f}")
-
-
-        time.sleep(1)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            current_future = executor.submit(collector.collect_current_price)
+            historical_future = executor.submit(collector.collect_historical_prices, days=365)
 
+            current_data = current_future.result()
+            historical_data = historical_future.result()
 
-        historical_data = collector.collect_historical_prices(days=365)
+        print(f"💰 Current Bitcoin Price: ${current_data['usd']:,.2f}")
 
 
         collector.save_raw_data(current_data, historical_data)
@@ -231,21 +336,20 @@ def main():
         collector.create_datapackage(csv_file)
 
         print("\n🎉 Data collection completed successfully!")
-        print(f"📈 Latest price: ${df_processed.iloc[-1]['price']:,.2f}")
-        print(f"📅 Data range: {df_processed.iloc[0]['date']} to {df_processed.iloc[-1]['date']}")
+        print(f"📈 Latest price: ${df_processed['price'].iat[-1]:,.2f}")
+        print(f"📅 Data range: {df_processed['date'].iat[0]:%Y-%m-%d} to {df_processed['date'].iat[-1]:%Y-%m-%d}")
 
 
         print("\n🔍 Validating Data Package...")
-        try:
-            import subprocess
-            result = subprocess.run(['frictionless', 'validate', 'datapackage.json'],
-                                  capture_output=True, text=True)
+        if FRICTIONLESS:
+            result = subprocess.run([FRICTIONLESS, 'validate', 'datapackage.json'],
+                                  stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
             if result.returncode == 0:
                 print("✅ Data Package validation successful!")
             else:
                 print("⚠️  Validation warnings:")
-                print(result.stdout)
-        except FileNotFoundError:
+                print(result.stdout.decode(errors='replace'))
+        else:
             print("ℹ️  Install frictionless to validate: pip install frictionless")
 
     except Exception as e:
@@ -8,15 +8,14 @@ import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import plotly.express as px
+from plotly.offline import get_plotlyjs_version
 from pathlib import Path
 import json
 
 def load_data():
     """Load the processed Bitcoin data"""
     try:
-        df = pd.read_csv("data/processed/bitcoin_prices.csv")
-        df['date'] = pd.to_datetime(df['date'])
-        df['datetime'] = pd.to_datetime(df['datetime'])
+        df = pd.read_csv("data/processed/bitcoin_prices.csv", parse_dates=['date', 'datetime'])
         return df
     except FileNotFoundError:
         print("❌ Error: Bitcoin price data not found. Run the collector script first.")
@@ -29,7 +28,7 @@ def create_simple_price_chart(df):
 
     # Add price line
     fig.add_trace(
-        go.Scatter(
+        go.Scattergl(
             x=df['date'],
             y=df['price'],
             mode='lines',
@@ -78,10 +77,11 @@ def create_volume_chart(df):
 def create_summary_stats(df):
     """Create summary statistics"""
 
-    current_price = df.iloc[-1]['price']
-    min_price = df['price'].min()
-    max_price = df['price'].max()
-    avg_price = df['price'].mean()
+    current_price = df['price'].iat[-1]
+    price_agg = df['price'].agg(['min', 'max', 'mean'])
+    min_price = price_agg['min']
+    max_price = price_agg['max']
+    avg_price = price_agg['mean']
 
     stats = {
         'Current Price': f'${current_price:,.2f}',
@@ -96,12 +96,27 @@ def create_summary_stats(df):
 def create_html_report(price_fig, volume_fig, stats):
     """Create HTML report with charts"""
 
+    price_div = price_fig.to_html(include_plotlyjs=False, full_html=False,
+                                  div_id='price-chart', config={'responsive': True})
+    volume_div = volume_fig.to_html(include_plotlyjs=False, full_html=False,
+                                    div_id='volume-chart', config={'responsive': True})
+
+    stat_boxes = "".join(
+        f"""
+            <div class="stat-box">
+                <h3>{value}</h3>
+                <p>{label}</p>
+            </div>
+        """
+        for label, value in stats.items()
+    )
+
     html_content = f"""
     <!DOCTYPE html>
     <html>
     <head>
         <title>Bitcoin Price Report</title>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+        <script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>
         <style>
             body {{ font-family: Arial, sans-serif; margin: 20px; }}
             .stats {{ display: flex; justify-content: space-around; margin: 20px 0; }}
@@ -114,37 +129,16 @@ def create_html_report(price_fig, volume_fig, stats):
         <p>Generated on: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M UTC')}</p>
 
         <div class="stats">
-    """
-
-    for label, value in stats.items():
-        html_content += f"""
-            <div class="stat-box">
-                <h3>{value}</h3>
-                <p>{label}</p>
-            </div>
-        """
-
-    html_content += """
+    {stat_boxes}
         </div>
 
         <div class="chart">
-            <div id="price-chart"></div>
+            {price_div}
         </div>
 
         <div class="chart">
-            <div id="volume-chart"></div>
+            {volume_div}
         </div>
-
-        <script>
-    """
-
-    html_content += f"""
-            var priceConfig = {price_fig.to_json()};
-            Plotly.newPlot('price-chart', priceConfig.data, priceConfig.layout, {{responsive: true}});
-
-            var volumeConfig = {volume_fig.to_json()};
-            Plotly.newPlot('volume-chart', volumeConfig.data, volumeConfig.layout, {{responsive: true}});
-        </script>
     </body>
     </html>
     """
@@ -175,8 +169,10 @@ def main():
     stats = create_summary_stats(df)
 
     # Save individual charts
-    price_fig.write_html("visualizations/bitcoin_price_chart.html")
-    volume_fig.write_html("visualizations/bitcoin_volume_chart.html")
+    price_fig.write_html("visualizations/bitcoin_price_chart.html",
+                         include_plotlyjs='cdn', full_html=True, validate=False)
+    volume_fig.write_html("visualizations/bitcoin_volume_chart.html",
+                          include_plotlyjs='cdn', full_html=True, validate=False)
 
     # Create report
     print("📄 Creating HTML report...")